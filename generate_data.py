@@ -11,9 +11,11 @@ can be imported directly after cloning without `pip install .`.
 from __future__ import annotations
 
 import argparse
-import sys
-import subprocess
 import importlib
+import importlib.util
+import os
+import subprocess
+import sys
 from pathlib import Path
 
 
@@ -27,19 +29,33 @@ def _ensure_src_on_path() -> None:
 _ensure_src_on_path()
 
 
+# Runtime dependencies the bootstrap may install: import name -> pip requirement.
+_REQUIREMENTS = {
+    "faker": "faker>=25.0.0,<26.0.0",
+    "numpy": "numpy>=1.24",
+}
+
+
+def _missing_dependencies() -> list[str]:
+    # find_spec locates the package without importing it, so Faker's startup cost is
+    # paid once, by the generator, rather than here as well.
+    return [name for name in _REQUIREMENTS if importlib.util.find_spec(name) is None]
+
+
 def _bootstrap_dependencies() -> None:
-    """Attempt to ensure required runtime dependency (faker) is available.
+    """Attempt to ensure required runtime dependencies (faker, numpy) are available.
 
     This avoids forcing the user to install pip first in very minimal Python environments.
-    If installation fails, we surface a friendly message and exit.
+    If installation fails, we surface a friendly message and exit. Set ``CDG_SKIP_BOOTSTRAP``
+    to skip the check entirely (e.g. in CI, where dependencies are installed up front).
     """
-    try:
-        importlib.import_module("faker")
+    if os.environ.get("CDG_SKIP_BOOTSTRAP"):
+        return
+    missing = _missing_dependencies()
+    if not missing:
         return  # already present
-    except ImportError:
-        pass
 
-    print("Dependency 'faker' not found. Attempting lightweight installation...", file=sys.stderr)
+    print(f"Dependencies not found: {', '.join(missing)}. Attempting lightweight installation...", file=sys.stderr)
     # Try ensurepip (may be unavailable in some distros if removed by vendor)
     try:
         import ensurepip  # type: ignore
@@ -49,7 +65,10 @@ def _bootstrap_dependencies() -> None:
 
     python_exec = sys.executable
     try:
-        subprocess.check_call([python_exec, "-m", "pip", "install", "faker>=25.0.0,<26.0.0"], stdout=subprocess.DEVNULL)
+        subprocess.check_call(
+            [python_exec, "-m", "pip", "install", *(_REQUIREMENTS[name] for name in missing)],
+            stdout=subprocess.DEVNULL,
+        )
     except Exception as e:  # pragma: no cover
         print("Automatic install failed.", file=sys.stderr)
         print("Please install dependencies manually, e.g.:", file=sys.stderr)
@@ -58,24 +77,25 @@ def _bootstrap_dependencies() -> None:
         print(f"Underlying error: {e}", file=sys.stderr)
         sys.exit(1)
 
-    try:
-        importlib.import_module("faker")
-    except ImportError:  # pragma: no cover
-        print("Installation reported success but 'faker' still not importable.", file=sys.stderr)
+    importlib.invalidate_caches()
+    still_missing = _missing_dependencies()
+    if still_missing:  # pragma: no cover
+        print(f"Installation reported success but {', '.join(still_missing)} still not importable.", file=sys.stderr)
         sys.exit(1)
 
 
-_bootstrap_dependencies()
-
-try:
-    from customer_data_generator import (
-        generate_customers_csv,
-        generate_patients_csv,
-    )
-except ImportError as e:  # pragma: no cover
-    print("Import error:", e, file=sys.stderr)
-    print("Ensure 'src' directory exists or install the package.", file=sys.stderr)
-    sys.exit(1)
+def _load_generators():
+    # Imported after argument parsing so --help and usage errors skip the package import.
+    try:
+        from customer_data_generator import (
+            generate_customers_csv,
+            generate_patients_csv,
+        )
+    except ImportError as e:  # pragma: no cover
+        print("Import error:", e, file=sys.stderr)
+        print("Ensure 'src' directory exists or install the package.", file=sys.stderr)
+        sys.exit(1)
+    return generate_customers_csv, generate_patients_csv
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -102,6 +122,8 @@ def build_parser() -> argparse.ArgumentParser:
 def main(argv: list[str] | None = None) -> int:
     parser = build_parser()
     args = parser.parse_args(argv)
+    _bootstrap_dependencies()
+    generate_customers_csv, generate_patients_csv = _load_generators()
 
     if args.entity == "customers":
         path = generate_customers_csv(
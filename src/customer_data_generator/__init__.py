@@ -3,21 +3,25 @@
 from .generator import (
     CustomerRecord,
     generate_customer_records,
+    generate_customer_records_arrays,
     generate_customers_csv,
 )
 from .patient_generator import (
     PatientRecord,
     generate_patient_records,
     generate_patients_csv,
+    generate_patients_parquet,
 )
 
 __all__ = [
     "CustomerRecord",
     "generate_customer_records",
+    "generate_customer_records_arrays",
     "generate_customers_csv",
     "PatientRecord",
     "generate_patient_records",
     "generate_patients_csv",
+    "generate_patients_parquet",
 ]
 
 __version__ = "0.2.0"
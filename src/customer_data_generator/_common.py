@@ -0,0 +1,429 @@
+from __future__ import annotations
+
+import csv
+import functools
+import hashlib
+import io
+import multiprocessing
+import os
+import queue
+import shutil
+import threading
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, UTC
+from pathlib import Path
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Any, BinaryIO, Callable, Iterable, Iterator, NamedTuple, Optional
+
+import numpy as np
+
+if TYPE_CHECKING:  # Faker and pyarrow are imported on first use to keep CLI startup fast
+    from faker import Faker
+
+# Records are drawn in fixed-size batches so memory stays bounded for large counts.
+_BATCH_SIZE = 10_000
+# Output file buffer size; each batch is rendered to one block and written in one call.
+_WRITE_BUFFER_BYTES = 4 << 20
+# Encoded CSV blocks that may wait for the background writer thread before generation blocks.
+_WRITE_QUEUE_DEPTH = 4
+# Distinct values pre-generated per Faker provider; rows sample from these pools.
+_POOL_SIZE = 2048
+# Names are pooled like the address providers, but larger since they vary far more.
+_NAME_POOL_SIZE = 10_000
+# Rows per independently seeded shard. Shards are the unit of parallel work, so the
+# output for a given seed is the same whatever the worker count.
+_SHARD_ROWS = 50_000
+
+# Held while a shard reseeds the shared Faker instance and draws its pools from it.
+_FAKER_LOCK = threading.Lock()
+
+# (shard, start, n, seed, locale, now) -> column batches in record field order
+_ShardColumns = Callable[[int, int, int, Optional[int], str, np.datetime64], Iterator[dict[str, np.ndarray]]]
+# (file, column batches) -> None; writes header-less rows
+_WriteColumns = Callable[[BinaryIO, Iterable[dict[str, np.ndarray]]], None]
+
+
+class _FakerMethods(NamedTuple):
+    """Faker provider methods resolved once per run instead of once per row."""
+
+    first_name: Callable[[], str]
+    last_name: Callable[[], str]
+    free_email_domain: Callable[[], str]
+    phone_number: Callable[[], str]
+    street_address: Callable[[], str]
+    city: Callable[[], str]
+    state: Callable[[], str]
+    postcode: Callable[[], str]
+    country: Callable[[], str]
+
+
+@functools.lru_cache(maxsize=8)
+def _get_faker(locale: str) -> Faker:
+    # Building a Faker loads every provider for the locale; reuse one instance per locale.
+    from faker import Faker
+
+    return Faker(locale)
+
+
+def _bind_faker(faker: Faker) -> _FakerMethods:
+    # Faker proxies attribute access through its provider chain; resolve each method up front.
+    return _FakerMethods(
+        first_name=faker.first_name,
+        last_name=faker.last_name,
+        free_email_domain=faker.free_email_domain,
+        phone_number=faker.phone_number,
+        street_address=faker.street_address,
+        city=faker.city,
+        state=faker.state_abbr if hasattr(faker, "state_abbr") else faker.state,
+        postcode=faker.postcode,
+        country=faker.current_country if hasattr(faker, "current_country") else faker.country,
+    )
+
+
+def _fixed_value_pools(fk: _FakerMethods) -> dict[str, np.ndarray]:
+    """Read the value lists behind providers that pick uniformly from a small fixed tuple.
+
+    Sampling these lists uniformly reproduces the provider exactly, with no
+    provider calls. Locales whose providers work differently are left out and
+    get ordinary sampled pools.
+    """
+    from faker.providers.address.en_US import Provider as USAddress
+
+    pools = {}
+    domains = getattr(fk.free_email_domain.__self__, "free_email_domains", None)
+    if isinstance(domains, tuple):
+        pools["email_domain"] = np.array([d.lower() for d in domains])
+    if fk.country.__name__ == "current_country":
+        pools["country"] = np.array([fk.country()])  # one fixed value per locale
+    address = fk.state.__self__
+    if getattr(type(address), "state_abbr", None) is USAddress.state_abbr:
+        pools["state"] = np.array(
+            address.states_abbr + address.territories_abbr + address.freely_associated_states_abbr
+        )
+    return pools
+
+
+def _build_pools(fk: _FakerMethods, size: int = _POOL_SIZE) -> dict[str, np.ndarray]:
+    """Pre-generate ``size`` values for the heavyweight address/contact providers."""
+    fixed = _fixed_value_pools(fk)
+    providers = {
+        "phone": fk.phone_number,
+        "street_address": lambda: fk.street_address().replace("\n", ", "),
+        "city": fk.city,
+        "state": fk.state,
+        "postal_code": fk.postcode,
+        "country": fk.country,
+        "email_domain": fk.free_email_domain,
+    }
+    return {
+        name: fixed[name] if name in fixed else np.array([draw() for _ in range(size)])
+        for name, draw in providers.items()
+    }
+
+
+def _build_name_pools(fk: _FakerMethods, size: int = _NAME_POOL_SIZE) -> dict[str, np.ndarray]:
+    return {
+        "first_name": np.array([fk.first_name() for _ in range(size)]),
+        "last_name": np.array([fk.last_name() for _ in range(size)]),
+    }
+
+
+def _shard_pools(
+    locale: str, seed: Optional[int], shard: int, pool_size: int, name_pool_size: int
+) -> tuple[dict[str, np.ndarray], dict[str, np.ndarray]]:
+    """Reseed the shared Faker for ``shard`` and draw its value and name pools.
+
+    The instance is shared per locale, so every Faker value a shard uses is drawn
+    here, right after reseeding; other runs (or threads) can't change the output.
+    """
+    faker = _get_faker(locale)
+    with _FAKER_LOCK:
+        # Reseed either way so an earlier seeded run doesn't leak its state.
+        faker.seed_instance(f"{seed}:{shard}" if seed is not None else None)
+        fk = _bind_faker(faker)
+        return _build_pools(fk, pool_size), _build_name_pools(fk, name_pool_size)
+
+
+def _sample_pools(pools: dict[str, np.ndarray], n: int, rng: np.random.Generator) -> dict[str, np.ndarray]:
+    return {name: pool[rng.integers(0, pool.size, n)] for name, pool in pools.items()}
+
+
+def _distinct_indices(size: int, k: int, n: int, rng: np.random.Generator) -> np.ndarray:
+    """``k`` rows of ``n`` indices into a pool of ``size`` values.
+
+    All ``k * n`` indices are distinct when the pool holds that many values; for
+    larger runs each column still never repeats its first-row index.
+    """
+    if k * n <= size:
+        return rng.permutation(size)[: k * n].reshape(k, n)
+    first = rng.integers(0, size, n)
+    rest = (first + rng.integers(1, size, (k - 1, n))) % size
+    return np.vstack([first, rest])
+
+
+def _emails(first_names: list[str], last_names: list[str], domains: list[str]) -> list[str]:
+    if not first_names:
+        return []
+    # Lowercase and strip apostrophes over the whole column in one pass each, not per row.
+    joined = "\n".join([f"{first}.{last}@{domain}" for first, last, domain in zip(first_names, last_names, domains)])
+    return joined.lower().replace("'", "").split("\n")
+
+
+def _run_kernel(
+    jit_kernel: Callable[[], Optional[Callable[..., np.ndarray]]],
+    numpy_kernel: Callable[..., np.ndarray],
+    *columns: np.ndarray,
+) -> np.ndarray:
+    """Apply a row-wise kernel to ``columns``, compiled by ``jit_kernel()`` when it returns one.
+
+    Only full batches go through the JIT kernel; small runs skip the import and compile cost.
+    """
+    if columns[0].size >= _BATCH_SIZE and (kernel := jit_kernel()) is not None:
+        return kernel(*columns)
+    return numpy_kernel(*columns)
+
+
+def _utc_now() -> np.datetime64:
+    """Reference time for one run; every batch and shard measures dates from it."""
+    return np.datetime64(datetime.now(UTC).replace(tzinfo=None), "us")
+
+
+def _deterministic_uuids(kind: str, seed: int, start: int, n: int) -> list[str]:
+    """``uuid5(NAMESPACE_URL, f"{kind}:{seed}:{i}")`` for ``i`` in ``start .. start + n - 1``.
+
+    The namespace and ``kind:seed:`` prefix are hashed once; each ID only hashes its index.
+    """
+    base = hashlib.sha1(uuid.NAMESPACE_URL.bytes + f"{kind}:{seed}:".encode())
+    ids = []
+    for i in range(start, start + n):
+        h = base.copy()
+        h.update(str(i).encode())
+        digest = bytearray(h.digest()[:16])
+        digest[6] = (digest[6] & 0x0F) | 0x50  # version 5
+        digest[8] = (digest[8] & 0x3F) | 0x80  # RFC 4122 variant
+        x = digest.hex()
+        ids.append(f"{x[:8]}-{x[8:12]}-{x[12:16]}-{x[16:20]}-{x[20:]}")
+    return ids
+
+
+def _random_uuids(n: int) -> list[str]:
+    """Return ``n`` version-4 UUID strings from a single ``os.urandom`` read."""
+    raw = np.frombuffer(os.urandom(16 * n), dtype=np.uint8).reshape(n, 16).copy()
+    raw[:, 6] = (raw[:, 6] & 0x0F) | 0x40  # version 4
+    raw[:, 8] = (raw[:, 8] & 0x3F) | 0x80  # RFC 4122 variant
+    hexed = raw.tobytes().hex()
+    return [
+        f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+        for h in (hexed[j : j + 32] for j in range(0, 32 * n, 32))
+    ]
+
+
+def _ids(kind: str, seed: Optional[int], start: int, n: int) -> np.ndarray:
+    """IDs for rows ``start .. start + n - 1``: stable UUIDv5 when seeded, random UUIDv4 otherwise."""
+    ids = _deterministic_uuids(kind, seed, start, n) if seed is not None else _random_uuids(n)
+    return np.array(ids, dtype=np.str_)
+
+
+def _shard_rng(seed: Optional[int], shard: int) -> np.random.Generator:
+    if seed is None:
+        return np.random.default_rng()
+    # SeedSequence entropy must be non-negative; fold negative seeds into range.
+    return np.random.default_rng([shard, seed % (1 << 128)])
+
+
+def _shards(count: int) -> list[tuple[int, int, int]]:
+    """Split ``count`` rows into ``(shard, start, n)`` work units."""
+    return [
+        (shard, start, min(_SHARD_ROWS, count - start))
+        for shard, start in enumerate(range(0, count, _SHARD_ROWS))
+    ]
+
+
+def _batches(start: int, n: int) -> Iterator[tuple[int, int]]:
+    """Split rows ``start .. start + n - 1`` of a shard into ``(batch_start, size)`` batches."""
+    for batch_start in range(start, start + n, _BATCH_SIZE):
+        yield batch_start, min(_BATCH_SIZE, start + n - batch_start)
+
+
+def _column_batches(
+    shard_columns: _ShardColumns, count: int, seed: Optional[int], locale: str, now: np.datetime64
+) -> Iterator[dict[str, np.ndarray]]:
+    for shard, start, n in _shards(count):
+        yield from shard_columns(shard, start, n, seed, locale, now)
+
+
+def _rows(batches: Iterable[dict[str, np.ndarray]]) -> Iterator[tuple]:
+    for columns in batches:
+        # tolist() yields native Python scalars for the record fields
+        yield from zip(*(col.tolist() for col in columns.values()))
+
+
+def _compile_rows_formatter(n_fields: int, schema: str) -> Callable[[Iterable[tuple]], str]:
+    """Build ``rows -> str`` for a fixed schema: one f-string per row, no per-cell dispatch.
+
+    Fields are interpolated with ``str()``, which matches what ``csv.writer`` emits for
+    values that need no quoting; ``_needs_quoting`` decides when that holds.
+    """
+    names = [f"c{i}" for i in range(n_fields)]
+    row = ",".join(f"{{{name}}}" for name in names)
+    source = (
+        "def _format_rows(rows):\n"
+        f"    return ''.join([f'{row}\\n' for {', '.join(names)} in rows])\n"
+    )
+    namespace: dict[str, Any] = {}
+    exec(compile(source, f"<{schema} rows formatter>", "exec"), namespace)
+    return namespace["_format_rows"]
+
+
+def _needs_quoting(columns: dict[str, list], str_fields: Iterable[str]) -> bool:
+    # One scan per string column; ``\0`` cannot appear in generated text.
+    for name in str_fields:
+        text = "\0".join(columns[name])
+        if "," in text or '"' in text or "\n" in text or "\r" in text:
+            return True
+    return False
+
+
+@contextmanager
+def _background_writes(f: BinaryIO) -> Iterator[Callable[[bytes], None]]:
+    """Yield a ``write`` that hands blocks to a thread writing them to ``f`` in order.
+
+    File writes release the GIL, so the next batch is generated while the
+    previous one is written. At most ``_WRITE_QUEUE_DEPTH`` blocks wait.
+    """
+    blocks: queue.Queue[Optional[bytes]] = queue.Queue(maxsize=_WRITE_QUEUE_DEPTH)
+    errors: list[BaseException] = []
+
+    def drain() -> None:
+        while (block := blocks.get()) is not None:
+            if not errors:
+                try:
+                    f.write(block)
+                except BaseException as e:  # re-raised in the generating thread
+                    errors.append(e)
+
+    def write(block: bytes) -> None:
+        if errors:
+            raise errors[0]
+        blocks.put(block)
+
+    thread = threading.Thread(target=drain, name="csv-writer", daemon=True)
+    thread.start()
+    try:
+        yield write
+    finally:
+        blocks.put(None)
+        thread.join()
+    if errors:
+        raise errors[0]
+
+
+def _write_csv_rows(
+    f: BinaryIO,
+    batches: Iterable[dict[str, np.ndarray]],
+    format_rows: Callable[[Iterable[tuple]], str],
+    str_fields: Iterable[str],
+) -> None:
+    """Write column batches as CSV rows, using ``csv.writer`` only for batches that need quoting."""
+    block = io.StringIO()
+    writer = csv.writer(block, lineterminator="\n")
+    with _background_writes(f) as write:
+        for columns in batches:
+            # tolist() converts to native Python scalars so values format as before
+            values = {name: col.tolist() for name, col in columns.items()}
+            rows = zip(*values.values())
+            if _needs_quoting(values, str_fields):
+                writer.writerows(rows)
+                text = block.getvalue()
+                block.seek(0)
+                block.truncate()
+            else:
+                text = format_rows(rows)
+            write(text.encode("utf-8"))
+
+
+@functools.cache
+def _pyarrow() -> Optional[SimpleNamespace]:
+    """pyarrow modules used by the ``arrow`` engine and Parquet output, or None if it isn't installed."""
+    try:
+        import pyarrow
+        import pyarrow.compute
+        import pyarrow.csv
+        import pyarrow.parquet
+    except ImportError:
+        return None
+    return SimpleNamespace(pa=pyarrow, compute=pyarrow.compute, csv=pyarrow.csv, parquet=pyarrow.parquet)
+
+
+def _write_shard(
+    shard_columns: _ShardColumns,
+    write_columns: _WriteColumns,
+    shard: int,
+    start: int,
+    n: int,
+    seed: Optional[int],
+    locale: str,
+    now: np.datetime64,
+    shard_path: Path,
+) -> None:
+    # Runs in a worker process; writes rows only, the parent writes the header.
+    with shard_path.open("wb", buffering=_WRITE_BUFFER_BYTES) as f:
+        write_columns(f, shard_columns(shard, start, n, seed, locale, now))
+
+
+def _write_shards_parallel(
+    f: BinaryIO,
+    out_path: Path,
+    write_shard: Callable[..., None],
+    shard_args: list[tuple],
+    workers: int,
+) -> None:
+    """Run ``write_shard(*args, part_path)`` for each shard in worker processes and append the parts to ``f``."""
+    part_paths = [out_path.with_name(f"{out_path.name}.part{i}") for i in range(len(shard_args))]
+    # Spawned workers: forking a parent that has started Numba/OpenMP or other
+    # threads can deadlock the children or the interpreter at exit.
+    context = multiprocessing.get_context("spawn")
+    try:
+        with ProcessPoolExecutor(max_workers=min(workers, len(shard_args)), mp_context=context) as pool:
+            futures = [pool.submit(write_shard, *args, part) for args, part in zip(shard_args, part_paths)]
+            # Concatenate in shard order as each shard completes.
+            for future, part in zip(futures, part_paths):
+                future.result()
+                with part.open("rb") as src:
+                    shutil.copyfileobj(src, f)
+                part.unlink()
+    finally:
+        for part in part_paths:
+            part.unlink(missing_ok=True)
+
+
+def _write_csv(
+    path: str | Path,
+    header: bytes,
+    count: int,
+    seed: Optional[int],
+    locale: str,
+    workers: int,
+    shard_columns: _ShardColumns,
+    write_columns: _WriteColumns,
+) -> Path:
+    """Write ``header`` and ``count`` rows to ``path``, across ``workers`` processes when there are several shards.
+
+    ``shard_columns`` and ``write_columns`` must be picklable (module-level
+    functions or partials of them) so spawned workers can run them.
+    """
+    out_path = Path(path)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    shards = _shards(count)
+    now = _utc_now()
+    with out_path.open("wb", buffering=_WRITE_BUFFER_BYTES) as f:
+        f.write(header)
+        if workers > 1 and len(shards) > 1:
+            write_shard = functools.partial(_write_shard, shard_columns, write_columns)
+            shard_args = [(shard, start, n, seed, locale, now) for shard, start, n in shards]
+            _write_shards_parallel(f, out_path, write_shard, shard_args, workers)
+        else:
+            write_columns(f, _column_batches(shard_columns, count, seed, locale, now))
+    return out_path
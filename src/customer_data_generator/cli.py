@@ -1,9 +1,17 @@
 from __future__ import annotations
 
 import argparse
+import os
 import sys
 
-from .generator import generate_customers_csv
+from .generator import ENGINES, generate_customers_csv
+
+
+def _positive_int(value: str) -> int:
+    n = int(value)
+    if n < 1:
+        raise argparse.ArgumentTypeError("must be >= 1")
+    return n
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -12,6 +20,8 @@ def build_parser() -> argparse.ArgumentParser:
     p.add_argument("--output", "-o", default="customers.csv", help="Output CSV file path (default: customers.csv)")
     p.add_argument("--seed", type=int, default=None, help="Optional random seed for reproducibility")
     p.add_argument("--locale", default="en_US", help="Faker locale (default: en_US)")
+    p.add_argument("--workers", "-j", type=_positive_int, default=os.cpu_count() or 1, help="Worker processes for large runs (default: CPU count)")
+    p.add_argument("--engine", choices=ENGINES, default="csv", help="CSV serializer; 'arrow' needs pyarrow and quotes string fields (default: csv)")
     return p
 
 
@@ -19,8 +29,8 @@ def main(argv: list[str] | None = None) -> int:
     parser = build_parser()
     args = parser.parse_args(argv)
     try:
-        path = generate_customers_csv(count=args.count, path=args.output, seed=args.seed, locale=args.locale)
-    except ValueError as e:
+        path = generate_customers_csv(count=args.count, path=args.output, seed=args.seed, locale=args.locale, workers=args.workers, engine=args.engine)
+    except (ValueError, RuntimeError) as e:
         print(f"Error: {e}", file=sys.stderr)
         return 2
     print(f"Wrote {args.count} records to {path}")
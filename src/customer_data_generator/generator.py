@@ -1,17 +1,37 @@
 from __future__ import annotations
 
-import csv
-import random
-import uuid
-import hashlib
-from dataclasses import dataclass, asdict
-from datetime import date, datetime, timedelta, UTC
+import functools
+from dataclasses import dataclass, fields
 from pathlib import Path
-from typing import Iterable, Optional
+from typing import TYPE_CHECKING, BinaryIO, Callable, Iterable, Iterator, Optional
 
-from faker import Faker
+import numpy as np
+
+from ._common import (
+    _NAME_POOL_SIZE,
+    _POOL_SIZE,
+    _batches,
+    _column_batches,
+    _compile_rows_formatter,
+    _distinct_indices,
+    _emails,
+    _ids,
+    _pyarrow,
+    _rows,
+    _run_kernel,
+    _sample_pools,
+    _shard_pools,
+    _shard_rng,
+    _utc_now,
+    _write_csv,
+    _write_csv_rows,
+)
+
+if TYPE_CHECKING:  # numba and pyarrow are imported on first use to keep CLI startup fast
+    import pyarrow as pa
 
 SEGMENTS = ["Enterprise", "SMB", "Consumer", "Non-Profit", "Education"]
+SEGMENT_WEIGHTS = [0.15, 0.25, 0.45, 0.05, 0.10]
 REFERRAL_SOURCES = [
     "Organic Search",
     "Paid Search",
@@ -23,8 +43,20 @@ REFERRAL_SOURCES = [
     "Affiliate",
 ]
 
+_ENTERPRISE = SEGMENTS.index("Enterprise")
+_CONSUMER = SEGMENTS.index("Consumer")
+_SEGMENTS_ARR = np.array(SEGMENTS)
+
+_DOB_START = np.datetime64("1940-01-01", "D")
+_DOB_SPAN_DAYS = (np.datetime64("2005-12-31", "D") - _DOB_START).astype(np.int64)
+_HOUR_US = 3_600_000_000
+_SIGNUP_WINDOW_US = 5 * 365 * 24 * _HOUR_US
+
+# CSV serializers accepted by generate_customers_csv(engine=...).
+ENGINES = ("csv", "arrow")
+
 
-@dataclass
+@dataclass(slots=True)
 class CustomerRecord:
     customer_id: str
     first_name: str
@@ -48,101 +80,209 @@ class CustomerRecord:
     churn_risk_score: float
 
 
-def _random_date(faker: Faker, start: date, end: date) -> date:
-    delta_days = (end - start).days
-    return start + timedelta(days=faker.random_int(min=0, max=delta_days))
+FIELDNAMES = tuple(f.name for f in fields(CustomerRecord))
+_COLUMN_DTYPES = {
+    f.name: {"str": np.str_, "bool": np.bool_, "int": np.int32, "float": np.float64}[f.type]
+    for f in fields(CustomerRecord)
+}
 
 
-def _generate_one(faker: Faker, customer_id: str) -> CustomerRecord:
-    dob = _random_date(
-        faker,
-        date(1940, 1, 1),
-        date(2005, 12, 31),
-    )
-    now = datetime.now(UTC)
-    signup_start = now - timedelta(days=5 * 365)
-    signup_dt = faker.date_time_between(start_date=signup_start, end_date=now)
-    if faker.random.random() < 0.8:
-        last_login_dt = faker.date_time_between(start_date=signup_dt, end_date=now)
-        is_active = True
-    else:
-        last_login_dt = signup_dt + timedelta(hours=faker.random_int(min=0, max=72))
-        is_active = False
-    lifetime_value = round(random.gammavariate(2.5, 120), 2)
-    segment = random.choices(
-        SEGMENTS,
-        weights=[0.15, 0.25, 0.45, 0.05, 0.10],
-        k=1,
-    )[0]
-    referral_source = random.choice(REFERRAL_SOURCES)
-    credit_score = int(min(850, max(300, random.gauss(690, 60))))
-    base_risk = 0.5
-    if is_active:
-        base_risk -= 0.15
-    if segment == "Enterprise":
-        base_risk -= 0.10
-    elif segment == "Consumer":
-        base_risk += 0.05
-    base_risk -= min(0.20, lifetime_value / 10000)
-    base_risk += random.uniform(-0.05, 0.05)
-    churn_risk = round(min(1.0, max(0.0, base_risk)), 3)
-    first_name = faker.first_name()
-    last_name = faker.last_name()
-    domain = faker.free_email_domain()
-    email = f"{first_name.lower()}.{last_name.lower()}@{domain}".replace("'", "")
-    return CustomerRecord(
-        customer_id=customer_id,
-        first_name=first_name,
-        last_name=last_name,
-        email=email,
-        phone=faker.phone_number(),
-        street_address=faker.street_address().replace("\n", ", "),
-        city=faker.city(),
-        state=faker.state_abbr() if hasattr(faker, "state_abbr") else faker.state(),
-        postal_code=faker.postcode(),
-        country=faker.current_country() if hasattr(faker, "current_country") else faker.country(),
-        date_of_birth=dob.isoformat(),
-        signup_date=signup_dt.isoformat(),
-        last_login=last_login_dt.isoformat(),
-        is_active=is_active,
-        lifetime_value=lifetime_value,
-        segment=segment,
-        marketing_opt_in=bool(random.random() < 0.6),
-        referral_source=referral_source,
-        credit_score=credit_score,
-        churn_risk_score=churn_risk,
+def _churn_risk_numpy(
+    is_active: np.ndarray, segment_idx: np.ndarray, lifetime_value: np.ndarray, noise: np.ndarray
+) -> np.ndarray:
+    base_risk = (
+        0.5
+        - 0.15 * is_active
+        - 0.10 * (segment_idx == _ENTERPRISE)
+        + 0.05 * (segment_idx == _CONSUMER)
+        - np.minimum(0.20, lifetime_value / 10000)
+        + noise
     )
+    return np.clip(base_risk, 0.0, 1.0)
+
+
+@functools.cache
+def _jit_kernel() -> Optional[Callable[..., np.ndarray]]:
+    """Compile the churn kernel with Numba (``jit`` extra), or return None if it isn't installed."""
+    try:
+        from numba import njit
+    except ImportError:
+        return None
+
+    # Single-threaded on purpose: large runs already fan out across worker processes.
+    @njit(cache=True)
+    def churn_risk(is_active, segment_idx, lifetime_value, noise):  # pragma: no cover - compiled
+        # Same operations in the same order as _churn_risk_numpy, so results are identical.
+        out = np.empty(lifetime_value.size)
+        for i in range(lifetime_value.size):
+            risk = 0.5
+            if is_active[i]:
+                risk -= 0.15
+            if segment_idx[i] == _ENTERPRISE:
+                risk -= 0.10
+            elif segment_idx[i] == _CONSUMER:
+                risk += 0.05
+            risk -= min(0.20, lifetime_value[i] / 10000)
+            risk += noise[i]
+            out[i] = min(1.0, max(0.0, risk))
+        return out
 
+    return churn_risk
 
-def _deterministic_uuid(seed: int, idx: int) -> str:
-    # Use uuid5 for stable, namespaced deterministic UUID based on seed and index
-    return str(uuid.uuid5(uuid.NAMESPACE_URL, f"customer:{seed}:{idx}"))
+
+def _activity_dates(
+    is_active: np.ndarray, rng: np.random.Generator, now: np.datetime64
+) -> tuple[np.ndarray, np.ndarray]:
+    """Signup within the last five years; active users log in any time since, others within 72h of signup."""
+    n = is_active.size
+    signup = now - rng.integers(0, _SIGNUP_WINDOW_US + 1, n).astype("timedelta64[us]")
+    since_signup = (now - signup).astype(np.int64)
+    active_gap = (rng.random(n) * since_signup).astype(np.int64)
+    inactive_gap = rng.integers(0, 73, n) * _HOUR_US
+    last_login = signup + np.where(is_active, active_gap, inactive_gap).astype("timedelta64[us]")
+    return signup, last_login
+
+
+def _generate_batch(n: int, rng: np.random.Generator, now: np.datetime64) -> dict[str, np.ndarray]:
+    """Draw the numeric and categorical columns for ``n`` customers in one vectorized pass."""
+    is_active = rng.random(n) < 0.8
+    lifetime_value = rng.gamma(2.5, 120, n).round(2)
+    segment_idx = rng.choice(len(SEGMENTS), size=n, p=SEGMENT_WEIGHTS)
+    referral_source = rng.choice(REFERRAL_SOURCES, n)
+    credit_score = rng.normal(690, 60, n).clip(300, 850).astype(np.int32)
+    marketing_opt_in = rng.random(n) < 0.6
+    noise = rng.uniform(-0.05, 0.05, n)
+    churn_risk_score = _run_kernel(_jit_kernel, _churn_risk_numpy, is_active, segment_idx, lifetime_value, noise).round(3)
+    dob = _DOB_START + rng.integers(0, _DOB_SPAN_DAYS + 1, n).astype("timedelta64[D]")
+    signup_date, last_login = _activity_dates(is_active, rng, now)
+    return {
+        "date_of_birth": np.datetime_as_string(dob, unit="D"),
+        "signup_date": np.datetime_as_string(signup_date, unit="us"),
+        "last_login": np.datetime_as_string(last_login, unit="us"),
+        "is_active": is_active,
+        "lifetime_value": lifetime_value,
+        "segment": _SEGMENTS_ARR[segment_idx],
+        "marketing_opt_in": marketing_opt_in,
+        "referral_source": referral_source,
+        "credit_score": credit_score,
+        "churn_risk_score": churn_risk_score,
+    }
+
+
+def _name_columns(
+    names: dict[str, np.ndarray], n: int, email_domain: np.ndarray, rng: np.random.Generator
+) -> dict[str, np.ndarray]:
+    """Build the name and email columns for one batch from the shard's name pools."""
+    pick = _distinct_indices(names["first_name"].size, 1, n, rng)[0]
+    first_names = names["first_name"][pick]
+    last_names = names["last_name"][pick]
+    emails = _emails(first_names.tolist(), last_names.tolist(), email_domain.tolist())
+    return {"first_name": first_names, "last_name": last_names, "email": np.array(emails, dtype=np.str_)}
+
+
+def _shard_columns(
+    shard: int, start: int, n: int, seed: Optional[int], locale: str, now: np.datetime64
+) -> Iterator[dict[str, np.ndarray]]:
+    """Generate rows ``start .. start + n - 1`` of one shard as column batches in FIELDNAMES order."""
+    pools, names = _shard_pools(locale, seed, shard, min(n, _POOL_SIZE), min(n, _NAME_POOL_SIZE))
+    rng = _shard_rng(seed, shard)
+    for batch_start, size in _batches(start, n):
+        columns = _generate_batch(size, rng, now)
+        columns.update(_sample_pools(pools, size, rng))
+        columns.update(_name_columns(names, size, columns.pop("email_domain"), rng))
+        columns["customer_id"] = _ids("customer", seed, batch_start, size)
+        yield {name: columns[name] for name in FIELDNAMES}
 
 
 def generate_customer_records(count: int, seed: Optional[int] = None, locale: str = "en_US") -> Iterable[CustomerRecord]:
     if count < 0:
         raise ValueError("count must be >= 0")
-    if seed is not None:
-        random.seed(seed)
-        faker = Faker(locale)
-        faker.seed_instance(seed)
+    for row in _rows(_column_batches(_shard_columns, count, seed, locale, _utc_now())):
+        yield CustomerRecord(*row)
+
+
+def generate_customer_records_arrays(
+    count: int, seed: Optional[int] = None, locale: str = "en_US"
+) -> dict[str, np.ndarray]:
+    """Generate ``count`` customers as one NumPy array per column (same data as the record generator)."""
+    if count < 0:
+        raise ValueError("count must be >= 0")
+    parts: dict[str, list[np.ndarray]] = {name: [] for name in FIELDNAMES}
+    for columns in _column_batches(_shard_columns, count, seed, locale, _utc_now()):
+        for name, arr in columns.items():
+            parts[name].append(arr)
+    return {
+        name: np.concatenate(arrs) if arrs else np.array([], dtype=_COLUMN_DTYPES[name])
+        for name, arrs in parts.items()
+    }
+
+
+_format_rows = _compile_rows_formatter(len(FIELDNAMES), "customer")
+_STR_FIELDS = tuple(name for name, dtype in _COLUMN_DTYPES.items() if dtype is np.str_)
+
+
+def _write_columns_csv(f: BinaryIO, batches: Iterable[dict[str, np.ndarray]]) -> None:
+    _write_csv_rows(f, batches, _format_rows, _STR_FIELDS)
+
+
+def _arrow_table(columns: dict[str, np.ndarray]) -> pa.Table:
+    arrow = _pyarrow()
+    pa = arrow.pa
+    arrays = {}
+    for name, col in columns.items():
+        arr = pa.array(col)  # converted from the NumPy buffer, no Python objects
+        if arr.type == pa.bool_():
+            # Keep Python's True/False spelling rather than Arrow's true/false.
+            arr = arrow.compute.if_else(arr, "True", "False")
+        arrays[name] = arr
+    return pa.table(arrays)
+
+
+def _write_columns_arrow(f: BinaryIO, batches: Iterable[dict[str, np.ndarray]]) -> None:
+    pa_csv = _pyarrow().csv
+    writer = None
+    options = pa_csv.WriteOptions(include_header=False)
+    for columns in batches:
+        table = _arrow_table(columns)
+        if writer is None:
+            writer = pa_csv.CSVWriter(f, table.schema, write_options=options)
+        writer.write_table(table)
+    if writer is not None:
+        writer.close()
+
+
+def _write_columns(f: BinaryIO, batches: Iterable[dict[str, np.ndarray]], engine: str) -> None:
+    """Write header-less CSV rows with the stdlib ``csv`` module or pyarrow's C++ writer."""
+    if engine == "arrow":
+        _write_columns_arrow(f, batches)
     else:
-        faker = Faker(locale)
-    for i in range(count):
-        if seed is not None:
-            cid = _deterministic_uuid(seed, i)
-        else:
-            cid = str(uuid.uuid4())
-        yield _generate_one(faker, cid)
-
-
-def generate_customers_csv(count: int, path: str | Path, seed: Optional[int] = None, locale: str = "en_US") -> Path:
-    out_path = Path(path)
-    out_path.parent.mkdir(parents=True, exist_ok=True)
-    fieldnames = [f for f in CustomerRecord.__annotations__.keys()]
-    with out_path.open("w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames, lineterminator="\n")
-        writer.writeheader()
-        for record in generate_customer_records(count=count, seed=seed, locale=locale):
-            writer.writerow(asdict(record))
-    return out_path
+        _write_columns_csv(f, batches)
+
+
+def generate_customers_csv(
+    count: int,
+    path: str | Path,
+    seed: Optional[int] = None,
+    locale: str = "en_US",
+    workers: int = 1,
+    engine: str = "csv",
+) -> Path:
+    """Write ``count`` customers to ``path``.
+
+    With ``workers > 1``, runs spanning more than one shard are generated across
+    that many processes; the default keeps everything in-process.
+
+    ``engine="arrow"`` serializes with pyarrow (``arrow`` extra). Its output quotes
+    every string field and writes whole-number floats without ``.0``.
+    """
+    if count < 0:
+        raise ValueError("count must be >= 0")
+    if workers < 1:
+        raise ValueError("workers must be >= 1")
+    if engine not in ENGINES:
+        raise ValueError(f"engine must be one of {', '.join(ENGINES)}")
+    if engine == "arrow" and _pyarrow() is None:
+        raise RuntimeError("pyarrow is not installed. Install the 'arrow' extra to use engine='arrow'.")
+    header = (",".join(FIELDNAMES) + "\n").encode()
+    write_columns = functools.partial(_write_columns, engine=engine)
+    return _write_csv(path, header, count, seed, locale, workers, _shard_columns, write_columns)
@@ -1,26 +1,42 @@
 from __future__ import annotations
 
 import argparse
+import os
 import sys
 
-from .patient_generator import generate_patients_csv
+from .cli import _positive_int
+from .patient_generator import generate_patients_csv, generate_patients_parquet
 
 
 def build_parser() -> argparse.ArgumentParser:
-    p = argparse.ArgumentParser(description="Generate fabricated patient data CSV (synthetic, non-PHI)")
+    p = argparse.ArgumentParser(description="Generate fabricated patient data as CSV or Parquet (synthetic, non-PHI)")
     p.add_argument("--count", "-c", type=int, required=True, help="Number of patient records to generate")
-    p.add_argument("--output", "-o", default="patients.csv", help="Output CSV file path (default: patients.csv)")
+    p.add_argument("--output", "-o", default=None, help="Output file path (default: patients.csv, or patients.parquet with --format parquet)")
     p.add_argument("--seed", type=int, default=None, help="Optional random seed for reproducibility (also stabilizes patient_id values)")
     p.add_argument("--locale", default="en_US", help="Faker locale (default: en_US)")
+    p.add_argument("--workers", "-j", type=_positive_int, default=None, help="Worker processes for large runs; CSV output only (default: CPU count)")
+    p.add_argument(
+        "--format",
+        choices=("csv", "parquet"),
+        default="csv",
+        help="Output format; parquet requires the 'arrow' extra (default: csv)",
+    )
     return p
 
 
 def main(argv: list[str] | None = None) -> int:
     parser = build_parser()
     args = parser.parse_args(argv)
+    if args.format == "parquet" and args.workers is not None:
+        parser.error("--workers applies to CSV output only; Parquet is written by a single process")
+    output = args.output or f"patients.{args.format}"
     try:
-        path = generate_patients_csv(count=args.count, path=args.output, seed=args.seed, locale=args.locale)
-    except ValueError as e:
+        if args.format == "parquet":
+            path = generate_patients_parquet(count=args.count, path=output, seed=args.seed, locale=args.locale)
+        else:
+            workers = args.workers or os.cpu_count() or 1
+            path = generate_patients_csv(count=args.count, path=output, seed=args.seed, locale=args.locale, workers=workers)
+    except (ValueError, RuntimeError) as e:
         print(f"Error: {e}", file=sys.stderr)
         return 2
     print(f"Wrote {args.count} patient records to {path}")
@@ -1,6 +1,7 @@
 import argparse
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from typing import Iterable, List, Optional, Sequence, Tuple
 
@@ -9,17 +10,35 @@ from contextlib import contextmanager
 
 try:
     import psycopg
+    from psycopg import sql
     from psycopg.rows import dict_row
 except Exception as e:  # pragma: no cover - handled at runtime
     psycopg = None  # type: ignore
+    sql = None  # type: ignore
     dict_row = None  # type: ignore
 
 
+# COPY data is forwarded to the destination in blocks of at least this many bytes.
+_COPY_BUFFER_BYTES = 1 << 20
+
+
 @dataclass
 class DSN:
     dsn: str
 
 
+class CopyError(RuntimeError):
+    """Some tables failed in a ``jobs > 1`` copy; the others were already committed."""
+
+    def __init__(self, copied: List[str], failed: List[Tuple[str, BaseException]]):
+        self.copied = copied
+        self.failed = failed
+        lines = [f"{len(failed)} of {len(copied) + len(failed)} tables failed to copy:"]
+        lines += [f" - {name}: {exc}" for name, exc in failed]
+        lines.append("Committed: " + (", ".join(copied) if copied else "none"))
+        super().__init__("\n".join(lines))
+
+
 def env_default(name: str, default: Optional[str] = None) -> Optional[str]:
     val = os.environ.get(name)
     return val if val else default
@@ -170,13 +189,60 @@ def copy_table(src_conn, dst_conn, schema: str, table: str, truncate: bool, crea
             ensure_table(dst_conn, src_conn, schema, table)
         if truncate:
             d_cur.execute(f"TRUNCATE TABLE {fq}")
+        # Don't wait for the WAL flush on commit; SET LOCAL reverts when the transaction ends.
+        d_cur.execute("SET LOCAL synchronous_commit = off")
 
         # Use COPY for fast transfer
         # Ensure schema search path contains the schema
         with s_cur.copy(f"COPY {fq} TO STDOUT WITH (FORMAT binary)") as copy_out:
             with d_cur.copy(f"COPY {fq} FROM STDIN WITH (FORMAT binary)") as copy_in:
-                for data in copy_out:
-                    copy_in.write(data)
+                stream_copy(copy_out, copy_in)
+
+
+def stream_copy(copy_out, copy_in, buffer_bytes: int = _COPY_BUFFER_BYTES) -> int:
+    """Forward COPY data from ``copy_out`` to ``copy_in`` and return the number of bytes moved.
+
+    The source yields roughly one row per read; rows are coalesced so the
+    destination sees a few large writes instead of one small write per row.
+    """
+    total = 0
+    buf = bytearray()
+    while data := copy_out.read():
+        buf += data
+        if len(buf) >= buffer_bytes:
+            copy_in.write(buf)
+            total += len(buf)
+            buf = bytearray()  # fresh buffer: the writer may still hold the old one
+    if buf:
+        copy_in.write(buf)
+        total += len(buf)
+    return total
+
+
+def select_tables(
+    conn, include: Optional[Sequence[str]] = None, exclude: Optional[Sequence[str]] = None
+) -> List[Tuple[str, str]]:
+    selected: List[Tuple[str, str]] = []
+    for schema, table in list_tables(conn):
+        fq = f"{schema}.{table}"
+        if include and not matches(fq, include):
+            continue
+        if exclude and matches(fq, exclude):
+            continue
+        selected.append((schema, table))
+    return selected
+
+
+def _copy_one(src_dsn: str, dst_dsn: str, snapshot: str, schema: str, table: str, truncate: bool) -> str:
+    # Runs in a worker thread with its own connections; psycopg connections are not shared across threads.
+    with pg_connect(src_dsn) as s_conn, pg_connect(dst_dsn) as d_conn:
+        with s_conn.cursor() as cur:
+            # Read from the coordinator's snapshot so every table reflects the same point in time.
+            cur.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ")
+            cur.execute(sql.SQL("SET TRANSACTION SNAPSHOT {}").format(sql.Literal(snapshot)))
+        copy_table(s_conn, d_conn, schema, table, truncate=truncate, create=False)
+        d_conn.commit()
+    return f"{schema}.{table}"
 
 
 def run_copy(
@@ -186,20 +252,53 @@ def run_copy(
     exclude: Optional[Sequence[str]] = None,
     truncate: bool = False,
     create: bool = True,
+    jobs: int = 1,
 ) -> List[str]:
-    copied: List[str] = []
+    """Copy the selected tables and return their ``schema.table`` names.
+
+    With ``jobs > 1`` tables are copied concurrently, each over its own pair of
+    connections and committed on its own; destination tables are created up
+    front in a single-threaded pass. Every table is attempted; if any fail,
+    ``CopyError`` lists them along with the tables that were committed. With
+    ``jobs=1`` everything is copied over one pair of connections and committed
+    once at the end.
+    """
+    if jobs < 1:
+        raise ValueError("jobs must be >= 1")
     with pg_connect(src_dsn) as s_conn, pg_connect(dst_dsn) as d_conn:
-        tables = list_tables(s_conn)
-        for schema, table in tables:
-            fq = f"{schema}.{table}"
-            if include and not matches(fq, include):
-                continue
-            if exclude and matches(fq, exclude):
-                continue
-            copy_table(s_conn, d_conn, schema, table, truncate=truncate, create=create)
-            copied.append(fq)
-        d_conn.commit()
-    return copied
+        if jobs == 1:
+            tables = select_tables(s_conn, include, exclude)
+            for schema, table in tables:
+                copy_table(s_conn, d_conn, schema, table, truncate=truncate, create=create)
+            d_conn.commit()
+            return [f"{schema}.{table}" for schema, table in tables]
+
+        with s_conn.cursor() as cur:
+            cur.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ")
+            cur.execute("SELECT pg_export_snapshot()")
+            snapshot = cur.fetchone()[0]
+        tables = select_tables(s_conn, include, exclude)
+        if create:
+            for schema, table in tables:
+                ensure_table(d_conn, s_conn, schema, table)
+            d_conn.commit()
+        # The exported snapshot stays valid while s_conn's transaction is open.
+        with ThreadPoolExecutor(max_workers=max(1, min(jobs, len(tables)))) as pool:
+            futures = [
+                pool.submit(_copy_one, src_dsn, dst_dsn, snapshot, schema, table, truncate)
+                for schema, table in tables
+            ]
+        # The pool has waited for every table; report them all in selection order.
+        copied: List[str] = []
+        failed: List[Tuple[str, BaseException]] = []
+        for (schema, table), future in zip(tables, futures):
+            if (exc := future.exception()) is not None:
+                failed.append((f"{schema}.{table}", exc))
+            else:
+                copied.append(future.result())
+        if failed:
+            raise CopyError(copied, failed)
+        return copied
 
 
 def build_arg_parser() -> argparse.ArgumentParser:
@@ -222,12 +321,21 @@ def build_arg_parser() -> argparse.ArgumentParser:
     p.add_argument("--exclude", help="Comma-separated list of schema.table names to skip", default=None)
     p.add_argument("--no-create", action="store_true", help="Do not create destination tables if missing")
     p.add_argument("--truncate", action="store_true", help="Truncate destination tables before copy")
+    p.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=1,
+        help="Tables copied concurrently, each over its own connections and committed separately (default: 1, one transaction)",
+    )
     return p
 
 
 def main(argv: Optional[Sequence[str]] = None) -> int:
     parser = build_arg_parser()
     args = parser.parse_args(argv)
+    if args.jobs < 1:
+        parser.error("--jobs must be >= 1")
 
     src_dsn = build_dsn(
         host=args.src_host, port=args.src_port, user=args.src_user, password=args.src_password, dbname=args.src_db
@@ -238,7 +346,7 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
 
     include, exclude = parse_table_list(args.include, args.exclude)
     try:
-        copied = run_copy(src_dsn, dst_dsn, include=include, exclude=exclude, truncate=args.truncate, create=not args.no_create)
+        copied = run_copy(src_dsn, dst_dsn, include=include, exclude=exclude, truncate=args.truncate, create=not args.no_create, jobs=args.jobs)
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)
         return 2
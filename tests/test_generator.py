@@ -1,4 +1,23 @@
-from customer_data_generator import generate_customer_records, generate_customers_csv, CustomerRecord
+import csv
+import io
+import subprocess
+import sys
+import uuid
+from dataclasses import asdict, astuple
+from pathlib import Path
+
+import numpy as np
+import pytest
+from faker import Faker
+
+from customer_data_generator import _common, generator
+from customer_data_generator import (
+    generate_customer_records,
+    generate_customer_records_arrays,
+    generate_customers_csv,
+    generate_patient_records,
+    CustomerRecord,
+)
 
 
 def test_generate_zero(tmp_path):
@@ -17,8 +36,227 @@ def test_record_count_and_determinism():
     assert all(isinstance(r, CustomerRecord) for r in recs1)
 
 
+def test_batch_columns_within_ranges():
+    now = _common._utc_now()
+    batch = generator._generate_batch(5000, np.random.default_rng(8), now)
+    assert batch["credit_score"].min() >= 300 and batch["credit_score"].max() <= 850
+    assert (batch["lifetime_value"] > 0).all()
+    assert (batch["churn_risk_score"] >= 0).all() and (batch["churn_risk_score"] <= 1).all()
+    assert set(batch["segment"].tolist()) <= set(generator.SEGMENTS)
+    assert set(batch["referral_source"].tolist()) <= set(generator.REFERRAL_SOURCES)
+    assert batch["is_active"].dtype == bool and batch["marketing_opt_in"].dtype == bool
+    assert min(batch["date_of_birth"]) >= "1940-01-01" and max(batch["date_of_birth"]) <= "2005-12-31"
+    assert (batch["last_login"] >= batch["signup_date"]).all()
+    assert max(batch["signup_date"]) <= str(now)
+
+
+def test_random_uuids_are_version_4():
+    ids = _common._random_uuids(500)
+    parsed = [uuid.UUID(x) for x in ids]
+    assert all(u.version == 4 and u.variant == uuid.RFC_4122 for u in parsed)
+    assert [str(u) for u in parsed] == ids
+    assert len(set(ids)) == 500
+
+
+def test_pool_sampling_stays_within_pools():
+    pools = _common._build_pools(_common._bind_faker(Faker("en_US")), size=16)
+    fixed = {"state", "country", "email_domain"}  # read from the provider lists, not sampled
+    assert all(pool.size == 16 for name, pool in pools.items() if name not in fixed)
+    sampled = _common._sample_pools(pools, 1000, np.random.default_rng(1))
+    for name, values in sampled.items():
+        assert values.size == 1000
+        assert set(values.tolist()) <= set(pools[name].tolist())
+    assert not any("\n" in v for v in pools["street_address"].tolist())
+
+
+def test_fixed_value_pools_cover_provider_values():
+    faker = Faker("en_US")
+    fk = _common._bind_faker(faker)
+    pools = _common._fixed_value_pools(fk)
+    assert pools["country"].tolist() == ["United States"]
+    assert set(pools["state"].tolist()) == {faker.state_abbr() for _ in range(3000)}
+    assert set(pools["email_domain"].tolist()) == {faker.free_email_domain() for _ in range(300)}
+
+
+def test_workers_must_be_positive(tmp_path):
+    with pytest.raises(ValueError):
+        generate_customers_csv(1, tmp_path / "bad.csv", workers=0)
+
+
+def test_deterministic_uuids_match_uuid5():
+    expected = [str(uuid.uuid5(uuid.NAMESPACE_URL, f"customer:-7:{i}")) for i in range(95, 105)]
+    assert _common._deterministic_uuids("customer", -7, 95, 10) == expected
+
+
+def test_arrays_match_records():
+    cols = generate_customer_records_arrays(6, seed=31)
+    recs = list(generate_customer_records(6, seed=31))
+    assert list(cols) == list(CustomerRecord.__annotations__)
+    assert cols["customer_id"].tolist() == [r.customer_id for r in recs]
+    assert cols["credit_score"].tolist() == [r.credit_score for r in recs]
+    empty = generate_customer_records_arrays(0)
+    assert empty["customer_id"].dtype.kind == "U" and empty["is_active"].dtype == bool
+    assert empty["credit_score"].size == 0
+
+
+def test_records_are_streamed(monkeypatch):
+    monkeypatch.setattr(_common, "_BATCH_SIZE", 8)
+    real_batch = generator._generate_batch
+    calls = []
+
+    def one_batch_only(n, rng, now):
+        calls.append(n)
+        assert len(calls) == 1, "records were materialized past the first batch"
+        return real_batch(n, rng, now)
+
+    monkeypatch.setattr(generator, "_generate_batch", one_batch_only)
+    first = next(iter(generate_customer_records(10**6, seed=2)))
+    assert isinstance(first, CustomerRecord)
+    assert calls == [8]
+
+
 def test_csv_written(tmp_path):
     out = generate_customers_csv(3, tmp_path / "three.csv", seed=9)
     lines = out.read_text().strip().splitlines()
     assert len(lines) == 4  # header + 3 rows
     assert lines[0].startswith("customer_id,")
+
+
+@pytest.mark.parametrize("city", ["Springfield", 'Fort "Smith", AR', "Two\nLines"])
+def test_csv_fast_path_matches_csv_writer(city):
+    columns = next(_common._column_batches(generator._shard_columns, 5, 3, "en_US", _common._utc_now()))
+    columns["city"] = columns["city"].astype(object)
+    columns["city"][2] = city
+    out = io.BytesIO()
+    generator._write_columns_csv(out, [columns])
+
+    expected = io.StringIO()
+    csv.writer(expected, lineterminator="\n").writerows(zip(*(c.tolist() for c in columns.values())))
+    assert out.getvalue().decode() == expected.getvalue()
+
+
+def test_background_writes_keep_order_and_raise_errors():
+    out = io.BytesIO()
+    with _common._background_writes(out) as write:
+        for i in range(50):
+            write(b"%d\n" % i)
+    assert out.getvalue() == b"".join(b"%d\n" % i for i in range(50))
+
+    class Full(io.BytesIO):
+        def write(self, data):
+            raise OSError("disk full")
+
+    with pytest.raises(OSError, match="disk full"):
+        with _common._background_writes(Full()) as write:
+            for _ in range(50):
+                write(b"x")
+
+
+def test_parallel_matches_serial(tmp_path, monkeypatch):
+    monkeypatch.setattr(_common, "_SHARD_ROWS", 4)
+    serial = generate_customers_csv(10, tmp_path / "serial.csv", seed=5, workers=1)
+    parallel = generate_customers_csv(10, tmp_path / "parallel.csv", seed=5, workers=2)
+    # signup_date / last_login are relative to "now", so compare the remaining columns
+    drop = {"signup_date", "last_login"}
+
+    def rows(p):
+        with p.open(newline="") as f:
+            return [{k: v for k, v in r.items() if k not in drop} for r in csv.DictReader(f)]
+
+    assert rows(serial) == rows(parallel)
+    assert len(rows(parallel)) == 10
+    assert not list(tmp_path.glob("*.part*"))
+
+
+def test_churn_jit_matches_numpy():
+    pytest.importorskip("numba")
+    rng = np.random.default_rng(3)
+    n = 1000
+    args = (rng.random(n) < 0.8, rng.integers(0, 5, n), rng.gamma(2.5, 120, n).round(2), rng.uniform(-0.05, 0.05, n))
+    assert np.array_equal(generator._jit_kernel()(*args), generator._churn_risk_numpy(*args))
+
+
+def test_arrow_engine_is_opt_in(tmp_path, monkeypatch):
+    monkeypatch.setattr(generator, "_pyarrow", lambda: None)
+    generate_customers_csv(2, tmp_path / "plain.csv", seed=4)  # default engine needs no pyarrow
+    with pytest.raises(RuntimeError):
+        generate_customers_csv(2, tmp_path / "arrow.csv", seed=4, engine="arrow")
+    with pytest.raises(ValueError):
+        generate_customers_csv(2, tmp_path / "x.csv", engine="parquet")
+
+
+def test_arrow_engine_matches_csv_engine(tmp_path):
+    pytest.importorskip("pyarrow")
+    arrow = generate_customers_csv(50, tmp_path / "arrow.csv", seed=4, engine="arrow")
+    plain = generate_customers_csv(50, tmp_path / "plain.csv", seed=4)
+    numeric = {"lifetime_value", "credit_score", "churn_risk_score"}
+    drop = {"signup_date", "last_login"}
+
+    def rows(p):
+        with p.open(newline="") as f:
+            return [
+                {k: float(v) if k in numeric else v for k, v in r.items() if k not in drop}
+                for r in csv.DictReader(f)
+            ]
+
+    assert rows(arrow) == rows(plain)
+
+
+def test_jit_then_process_pool_exits_cleanly(tmp_path):
+    pytest.importorskip("numba")
+    src = Path(__file__).resolve().parent.parent / "src"
+    out = tmp_path / "after_jit.csv"
+    script = f"""
+import sys
+sys.path.insert(0, {str(src)!r})
+from customer_data_generator import _common, generate_customer_records, generate_customers_csv
+_common._BATCH_SIZE = 8
+_common._SHARD_ROWS = 16
+list(generate_customer_records(16, seed=1))  # full batches -> JIT kernel in the parent
+generate_customers_csv(40, {str(out)!r}, seed=1, workers=2)
+"""
+    r = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, timeout=120)
+    assert r.returncode == 0, r.stderr
+    assert len(out.read_text().splitlines()) == 41
+
+
+def test_customer_record_uses_slots():
+    rec = next(iter(generate_customer_records(1, seed=6)))
+    assert not hasattr(rec, "__dict__")
+    assert list(asdict(rec)) == list(CustomerRecord.__annotations__)
+    assert len(astuple(rec)) == len(CustomerRecord.__annotations__)
+
+
+def test_cached_faker_is_reseeded_per_run():
+    names = lambda seed: [r.first_name for r in generate_customer_records(20, seed=seed)]  # noqa: E731
+    first = names(42)
+    names(None)
+    assert names(42) == first
+
+
+def test_emails_lowercased_without_apostrophes():
+    assert _common._emails(["Sean", "Ann"], ["O'Neil", "Lee"], ["x.com", "y.org"]) == [
+        "sean.oneil@x.com",
+        "ann.lee@y.org",
+    ]
+    assert _common._emails([], [], []) == []
+
+
+def test_seeded_run_unaffected_by_interleaved_runs(monkeypatch):
+    monkeypatch.setattr(_common, "_BATCH_SIZE", 4)
+    names = lambda recs: [(r.first_name, r.last_name, r.email) for r in recs]  # noqa: E731
+    alone = names(generate_customer_records(12, seed=1))
+    records = iter(generate_customer_records(12, seed=1))
+    first = next(records)
+    list(generate_customer_records(3, seed=9))
+    list(generate_patient_records(3, seed=9))
+    assert names([first, *records]) == alone
+
+
+def test_distinct_indices():
+    rng = np.random.default_rng(4)
+    small = _common._distinct_indices(12, 3, 4, rng)
+    assert small.shape == (3, 4) and len(set(small.ravel().tolist())) == 12
+    large = _common._distinct_indices(5, 3, 1000, rng)
+    assert large.shape == (3, 1000) and large.min() >= 0 and large.max() < 5
+    assert (large[1:] != large[0]).all()
@@ -1,4 +1,23 @@
-from customer_data_generator import generate_patient_records, generate_patients_csv, PatientRecord
+import csv
+import dataclasses
+import io
+import random
+import uuid
+from datetime import UTC, datetime, timedelta
+
+import numpy as np
+import pytest
+
+from customer_data_generator import generate_patient_records, generate_patients_csv, generate_patients_parquet, PatientRecord
+from customer_data_generator import _common, patient_cli, patient_generator
+from customer_data_generator.patient_generator import (
+    ALLERGIES,
+    BLOOD_TYPES,
+    CHRONIC_CONDITIONS,
+    GENDERS,
+    MEDICATIONS,
+    SMOKING_STATUS,
+)
 
 
 def test_patient_zero(tmp_path):
@@ -12,6 +31,7 @@ def test_patient_determinism():
     a = list(generate_patient_records(3, seed=77))
     b = list(generate_patient_records(3, seed=77))
     assert [r.patient_id for r in a] == [r.patient_id for r in b]
+    assert [r.patient_id for r in a] == [str(uuid.uuid5(uuid.NAMESPACE_URL, f"patient:77:{i}")) for i in range(3)]
     assert all(isinstance(r, PatientRecord) for r in a)
 
 
@@ -21,4 +41,140 @@ def test_patient_csv(tmp_path):
     assert len(lines) == 5
     header = lines[0].split(',')
     assert 'risk_score' in header
-    assert any(';' in l or ',,' in l for l in lines[1:])  # some lists may be empty or joined
\ No newline at end of file
+    assert any(';' in l or ',,' in l for l in lines[1:])  # some lists may be empty or joined
+
+
+def test_patient_parquet_matches_records(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    out = generate_patients_parquet(5, tmp_path / "patients.parquet", seed=11)
+    table = pq.read_table(out)
+    assert table.column_names == [f.name for f in dataclasses.fields(PatientRecord)]
+    assert table.schema.field("blood_type").type.value_type == "string"  # dictionary-encoded
+    drop = {"last_visit_date", "next_appointment_date"}  # relative to the current time
+    expected = [{k: v for k, v in dataclasses.asdict(r).items() if k not in drop} for r in generate_patient_records(5, seed=11)]
+    assert [{k: v for k, v in row.items() if k not in drop} for row in table.to_pylist()] == expected
+
+
+def test_patient_parquet_requires_pyarrow(tmp_path, monkeypatch):
+    monkeypatch.setattr(patient_generator, "_pyarrow", lambda: None)
+    with pytest.raises(RuntimeError):
+        generate_patients_parquet(1, tmp_path / "p.parquet")
+
+
+def test_patient_vectorized_columns_in_range():
+    recs = list(generate_patient_records(200, seed=5))
+    assert all(140 <= r.height_cm <= 205 and 40 <= r.weight_kg <= 180 for r in recs)
+    assert all(r.bmi == round(r.weight_kg / (r.height_cm / 100) ** 2, 1) for r in recs)
+    assert {r.gender for r in recs} <= set(GENDERS)
+    assert {r.blood_type for r in recs} <= set(BLOOD_TYPES)
+    assert {r.smoking_status for r in recs} <= set(SMOKING_STATUS)
+    assert all(isinstance(r.height_cm, int) and isinstance(r.bmi, float) for r in recs)
+    assert all(len(r.medical_record_number) == 11 and r.medical_record_number[:3] == "MRN" for r in recs)
+    assert all(r.medical_record_number[3:].isdigit() for r in recs)
+
+
+def test_patient_risk_jit_matches_numpy():
+    pytest.importorskip("numba")
+    rng = np.random.default_rng(3)
+    n = 1000
+    args = (
+        rng.integers(0, 101, n),
+        rng.uniform(15, 45, n).round(1),
+        rng.integers(0, 5, n),
+        rng.integers(0, 3, n),
+        rng.uniform(-0.03, 0.03, n),
+    )
+    assert np.array_equal(patient_generator._risk_jit_kernel()(*args), patient_generator._risk_score_numpy(*args))
+
+
+def test_patient_risk_score_matches_rules():
+    ages = np.array([0, 80, 40, 100])
+    bmis = np.array([20.0, 31.0, 26.0, 40.0])
+    conds = np.array([0, 4, 1, 4])
+    smoking = np.array([0, 2, 1, 2])  # Never, Current, Former, Current
+    out = patient_generator._risk_score(ages, bmis, conds, smoking, np.zeros(4))
+    assert out.tolist() == [0.1, round(0.1 + 0.3 + 0.15 + 0.24 + 0.2, 3), round(0.1 + 0.2 + 0.07 + 0.06 + 0.05, 3), 0.99]
+
+
+def test_patient_parallel_matches_serial(tmp_path, monkeypatch):
+    monkeypatch.setattr(_common, "_SHARD_ROWS", 4)
+    serial = generate_patients_csv(10, tmp_path / "serial.csv", seed=5, workers=1)
+    parallel = generate_patients_csv(10, tmp_path / "parallel.csv", seed=5, workers=2)
+    drop = {"last_visit_date", "next_appointment_date"}  # relative to the current time
+
+    def rows(p):
+        with p.open(newline="") as f:
+            return [{k: v for k, v in r.items() if k not in drop} for r in csv.DictReader(f)]
+
+    assert rows(serial) == rows(parallel)
+    assert len(rows(serial)) == 10
+    with pytest.raises(ValueError):
+        generate_patients_csv(1, tmp_path / "x.csv", workers=0)
+
+
+def test_patient_visit_dates_within_windows():
+    before = datetime.now(UTC).replace(tzinfo=None)
+    recs = list(generate_patient_records(300, seed=8))
+    after = datetime.now(UTC).replace(tzinfo=None)
+    for r in recs:
+        last_visit = datetime.fromisoformat(r.last_visit_date)
+        assert before - timedelta(days=365) <= last_visit <= after
+        if r.next_appointment_date:
+            assert before <= datetime.fromisoformat(r.next_appointment_date) <= after + timedelta(days=180)
+    assert 0 < sum(1 for r in recs if not r.next_appointment_date) < 300
+
+
+def test_patient_generation_leaves_global_random_alone():
+    random.seed(123)
+    expected = random.random()
+    random.seed(123)
+    list(generate_patient_records(5, seed=1))
+    assert random.random() == expected
+
+
+def test_patient_list_columns_are_distinct_known_values():
+    recs = list(generate_patient_records(200, seed=9))
+    for column, options, most in (
+        ("chronic_conditions", CHRONIC_CONDITIONS, 4),
+        ("allergies", ALLERGIES, 3),
+        ("medications_current", MEDICATIONS, 4),
+    ):
+        picks = [getattr(r, column).split(";") if getattr(r, column) else [] for r in recs]
+        assert all(len(p) == len(set(p)) <= most and set(p) <= set(options) for p in picks)
+        assert {len(p) for p in picks} == set(range(most + 1))
+
+
+@pytest.mark.parametrize("address", ["12 Elm St", "12 Elm St, Apt 4", 'The "Old" Mill'])
+def test_patient_csv_fast_path_matches_csv_writer(address):
+    columns = next(_common._column_batches(patient_generator._shard_columns, 4, 3, "en_US", _common._utc_now()))
+    columns["street_address"] = columns["street_address"].astype(object)
+    columns["street_address"][1] = address
+    out = io.BytesIO()
+    patient_generator._write_columns_csv(out, [columns])
+
+    expected = io.StringIO()
+    csv.writer(expected, lineterminator="\n").writerows(zip(*(c.tolist() for c in columns.values())))
+    assert out.getvalue().decode() == expected.getvalue()
+
+
+def test_patient_cli_output_follows_format(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    written = []
+    monkeypatch.setattr(patient_cli, "generate_patients_parquet", lambda **kw: written.append(kw["path"]) or kw["path"])
+    assert patient_cli.main(["-c", "1", "--format", "parquet"]) == 0
+    assert patient_cli.main(["-c", "1", "--seed", "3"]) == 0
+    assert written == ["patients.parquet"]
+    assert (tmp_path / "patients.csv").exists()
+    with pytest.raises(SystemExit):
+        patient_cli.main(["-c", "1", "--format", "parquet", "-j", "2"])
+
+
+@pytest.mark.parametrize("count", [1, 20])
+def test_patient_small_runs_use_distinct_people(count):
+    for seed in range(5):
+        recs = list(generate_patient_records(count, seed=seed))
+        for r in recs:
+            patient = f"{r.first_name} {r.last_name}"
+            assert patient != r.emergency_contact_name and f"Dr. {patient}" != r.primary_physician
+            assert r.phone != r.emergency_contact_phone
+        assert len({r.first_name for r in recs}) > count * 3 // 4
@@ -0,0 +1,151 @@
+import threading
+import time
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import pytest
+
+from pg_table_copy import cli
+from pg_table_copy.cli import CopyError, main, run_copy, stream_copy
+
+
+class FakeCopyOut:
+    def __init__(self, chunks):
+        self.chunks = list(chunks)
+
+    def read(self):
+        return self.chunks.pop(0) if self.chunks else b""
+
+
+class FakeCopyIn:
+    def __init__(self):
+        self.writes = []
+
+    def write(self, data):
+        self.writes.append(bytes(data))
+
+
+def test_stream_copy_coalesces_rows():
+    rows = [bytes([i]) * 10 for i in range(25)]
+    copy_in = FakeCopyIn()
+    assert stream_copy(FakeCopyOut(rows), copy_in, buffer_bytes=100) == 250
+    assert b"".join(copy_in.writes) == b"".join(rows)
+    assert [len(w) for w in copy_in.writes] == [100, 100, 50]
+
+
+def test_stream_copy_empty():
+    copy_in = FakeCopyIn()
+    assert stream_copy(FakeCopyOut([]), copy_in) == 0
+    assert copy_in.writes == []
+
+
+def test_jobs_must_be_positive():
+    with pytest.raises(ValueError):
+        run_copy("", "", jobs=0)
+    with pytest.raises(SystemExit):
+        main(["-j", "0"])
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self.result = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, query, params=None):
+        self.conn.log(str(query))
+        if "pg_export_snapshot" in query:
+            self.result = ("snap-1",)
+
+    def fetchone(self):
+        return self.result
+
+    @contextmanager
+    def copy(self, statement):
+        self.conn.log(statement)
+        if "FROM STDIN" in statement and any(f'"{table}"' in statement for table in self.conn.fail_on):
+            raise RuntimeError("disk full")
+        if '"a"' in statement and "TO STDOUT" in statement:
+            time.sleep(0.05)  # finishes last, results must still come back in table order
+        yield FakeCopyOut([b"row"]) if "TO STDOUT" in statement else FakeCopyIn()
+
+
+class FakeConn:
+    def __init__(self, dsn, fail_on):
+        self.dsn = dsn
+        self.fail_on = fail_on
+        self.statements = []
+
+    def log(self, statement):
+        self.statements.append(statement)
+
+    def cursor(self, row_factory=None):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.log("COMMIT")
+
+
+@pytest.fixture
+def fake_pg(monkeypatch):
+    conns = []
+    lock = threading.Lock()
+    fail_on = set()
+
+    @contextmanager
+    def pg_connect(dsn, autocommit=False):
+        conn = FakeConn(dsn, fail_on)
+        with lock:
+            conns.append(conn)
+        yield conn
+
+    def ensure_table(dst_conn, src_conn, schema, table):
+        dst_conn.log(f"ENSURE {schema}.{table}")
+
+    tables = [("public", "a"), ("public", "b"), ("public", "c")]
+    monkeypatch.setattr(cli, "pg_connect", pg_connect)
+    monkeypatch.setattr(cli, "select_tables", lambda conn, include, exclude: tables)
+    monkeypatch.setattr(cli, "ensure_table", ensure_table)
+    monkeypatch.setattr(cli, "sql", SimpleNamespace(SQL=str, Literal=lambda v: f"'{v}'"))
+    return SimpleNamespace(conns=conns, fail_on=fail_on)
+
+
+def _worker_statements(conns, dsn, table):
+    matching = [c.statements for c in conns[2:] if c.dsn == dsn and any(f'"{table}"' in s for s in c.statements)]
+    assert len(matching) == 1
+    return matching[0]
+
+
+def test_parallel_copy_statement_sequence(fake_pg):
+    assert run_copy("src", "dst", jobs=2) == ["public.a", "public.b", "public.c"]
+    coordinator_src, coordinator_dst = fake_pg.conns[:2]
+    assert coordinator_src.statements == ["SET TRANSACTION ISOLATION LEVEL REPEATABLE READ", "SELECT pg_export_snapshot()"]
+    assert coordinator_dst.statements == ["ENSURE public.a", "ENSURE public.b", "ENSURE public.c", "COMMIT"]
+    assert len(fake_pg.conns) == 2 + 2 * 3
+    for table in "abc":
+        assert _worker_statements(fake_pg.conns, "src", table) == [
+            "SET TRANSACTION ISOLATION LEVEL REPEATABLE READ",
+            "SET TRANSACTION SNAPSHOT 'snap-1'",
+            f'COPY "public"."{table}" TO STDOUT WITH (FORMAT binary)',
+        ]
+        # create=False in the workers: no ENSURE, tables already exist
+        assert _worker_statements(fake_pg.conns, "dst", table) == [
+            "SET LOCAL synchronous_commit = off",
+            f'COPY "public"."{table}" FROM STDIN WITH (FORMAT binary)',
+            "COMMIT",
+        ]
+
+
+def test_parallel_copy_reports_failed_and_committed_tables(fake_pg):
+    fake_pg.fail_on.add("b")
+    with pytest.raises(CopyError) as info:
+        run_copy("src", "dst", jobs=3)
+    assert info.value.copied == ["public.a", "public.c"]
+    assert [name for name, _ in info.value.failed] == ["public.b"]
+    assert "public.b: disk full" in str(info.value) and "Committed: public.a, public.c" in str(info.value)
+    assert _worker_statements(fake_pg.conns, "dst", "c")[-1] == "COMMIT"